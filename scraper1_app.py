@@ -1,14 +1,29 @@
 import streamlit as st
 import pandas as pd
-import time
 import os
+import io
+import atexit
+import asyncio
+import csv
+import queue
+import threading
+import functools
+import multiprocessing as mp
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from difflib import SequenceMatcher
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from pybloom_live import ScalableBloomFilter
+import xlsxwriter
 import tempfile
 from datetime import datetime
+from scraper_core import fetch_pages, make_matcher, match_page, scrape_batch
 
 # Page configuration
 st.set_page_config(
@@ -87,12 +102,24 @@ else:
 # Scraping settings
 st.sidebar.markdown("### ⚡ Scraping Settings")
 max_links_per_site = st.sidebar.number_input("Max Links Per Site", 1, 50, 12)
-scroll_delay = st.sidebar.slider("Scroll Delay (seconds)", 1, 10, 3)
-page_delay = st.sidebar.slider("Page Load Delay (seconds)", 3, 15, 5)
+scroll_delay = st.sidebar.slider("Max Scroll Wait (seconds)", 1, 10, 3)
+page_delay = st.sidebar.slider("Max Page Load Wait (seconds)", 3, 15, 5)
+worker_processes = st.sidebar.number_input("Worker Processes (HTTP mode)", 1, os.cpu_count() or 1, 1)
 
 # Browser settings
 st.sidebar.markdown("### 🖥️ Browser Settings")
 headless_mode = st.sidebar.checkbox("Run in Background (Headless)", value=True)
+use_selenium = st.sidebar.checkbox("Render JavaScript with Selenium (slower)", value=False)
+
+# Keyword columns are named Keyword1, Keyword2, ...
+KEYWORD_PREFIX = 'Keyword'
+
+# Parse and inspect the uploaded CSV only when its contents change, not on every rerun
+@st.cache_data(show_spinner=False)
+def load_and_validate(csv_bytes):
+    df = pd.read_csv(io.BytesIO(csv_bytes), engine="pyarrow", dtype_backend="pyarrow")
+    keyword_cols = [col for col in df.columns if col.startswith(KEYWORD_PREFIX)]
+    return df, keyword_cols
 
 # --- Main Content Area ---
 col1, col2 = st.columns([2, 1])
@@ -102,17 +129,16 @@ with col1:
     
     if uploaded_csv is not None:
         try:
-            df_input = pd.read_csv(uploaded_csv)
+            df_input, keyword_cols = load_and_validate(uploaded_csv.getvalue())
             st.dataframe(df_input.head(), use_container_width=True)
             
             # Validate columns
             brand_col = 'Brand'
-            keyword_cols = [col for col in df_input.columns if 'Keyword' in col]
             
             if brand_col not in df_input.columns:
                 st.error("❌ CSV must have a 'Brand' column")
             elif not keyword_cols:
-                st.error("❌ CSV must have at least one 'Keyword' column")
+                st.error("❌ CSV must have at least one column whose name starts with 'Keyword'")
             else:
                 st.success(f"✅ Found {len(df_input)} brands with {len(keyword_cols)} keyword columns")
                 
@@ -143,60 +169,109 @@ with col2:
 
 # --- Backend Functions ---
 
-# Fuzzy matching function
-def fuzzy_match_brand(text, brand_name, threshold=80):
-    if not fuzzy_enabled:
-        return brand_name.lower() in text.lower()
-    
-    text_lower = text.lower()
-    brand_lower = brand_name.lower()
-    
-    if brand_lower in text_lower:
-        return True
-    
-    words = text_lower.split()
-    for word in words:
-        if len(word) >= 3:
-            similarity = SequenceMatcher(None, brand_lower, word).ratio() * 100
-            if similarity >= threshold:
-                return True
-    return False
-
 # Site configurations
-def get_site_configs():
+@st.cache_data(show_spinner=False)
+def get_site_configs(selected_sites):
     all_configs = {
         'Alibaba': {
             'url_template': 'https://www.alibaba.com/trade/search?SearchText={search_term}&page={page}',
             'url_encoding': '%20',
             'product_selector': 'a[href*="/product-detail/"]',
             'brand_in_url': True,
-            'domain_check': 'alibaba.com',
-            'additional_selectors': []
+            'domain_check': 'alibaba.com'
         },
         'DHgate': {
             'url_template': 'https://www.dhgate.com/wholesale/search.do?act=search&searchkey={search_term}&pageNum={page}',
             'url_encoding': '+',
             'product_selector': 'a[href*="/product/"]',
             'brand_in_url': False,
-            'domain_check': 'dhgate.com',
-            'additional_selectors': []
+            'domain_check': 'dhgate.com'
         },
         'Made-in-China': {
             'url_template': 'https://www.made-in-china.com/products-search/hot-china-products/{search_term}.html?page={page}',
             'url_encoding': '-',
-            'product_selector': 'a[href*="/product/"]',
+            'product_selector': 'a[href*="/product/"], a[href*="/prod/"], .item-link a, .product-item a',
             'brand_in_url': False,
-            'domain_check': 'made-in-china.com',
-            'additional_selectors': ['a[href*="/prod/"]', '.item-link a', '.product-item a']
+            'domain_check': 'made-in-china.com'
         }
     }
-    return {k: v for k, v in all_configs.items() if sites_config.get(k, False)}
+    return {k: v for k, v in all_configs.items() if k in selected_sites}
+
+# Build the search URL for one site
+def build_search_url(config, search_term, page=1):
+    if config['url_encoding'] == '-':
+        formatted_term = search_term.replace(' ', '-').lower()
+    else:
+        formatted_term = search_term.replace(' ', config['url_encoding'])
+    return config['url_template'].format(search_term=formatted_term, page=page)
 
-# Main scraping function - MODIFIED FOR CLOUD DEPLOYMENT
-def run_scraper(df_input, progress_bar, status_text):
-    results = []
-    sites = get_site_configs()
+# Fetch every search page in this process, handing over links as each page arrives
+def scrape_with_httpx(pages, sites, on_page, progress_bar, status_text):
+    completed = 0
     
+    def on_result(page, outcome):
+        nonlocal completed
+        if isinstance(outcome, Exception):
+            st.warning(f"⚠️ Error scraping {page[0]}: {str(outcome)}")
+        else:
+            on_page(page, outcome)
+        
+        completed += 1
+        progress_bar.progress(completed / len(pages))
+        status_text.text(f"🔍 Fetched {completed}/{len(pages)} search pages...")
+    
+    asyncio.run(fetch_pages(pages, sites, on_result))
+
+# Search pages handed to each worker process at a time
+PAGES_PER_BATCH = 20
+
+# Shard search pages across worker processes for matching-heavy runs
+def scrape_in_processes(pages, searches_by_url, sites, emit, progress_bar, status_text):
+    batches = [
+        [(page, list(searches_by_url[page[2]])) for page in pages[i:i + PAGES_PER_BATCH]]
+        for i in range(0, len(pages), PAGES_PER_BATCH)
+    ]
+    completed = 0
+    
+    # Spawn rather than fork: forking Streamlit's multi-threaded server can deadlock the children.
+    # Workers run scraper_core.scrape_batch with every setting passed explicitly. Spawn still re-runs
+    # this script in each worker as __mp_main__, but its Streamlit calls do nothing outside a session.
+    worker = functools.partial(scrape_batch, sites, fuzzy_enabled, fuzzy_threshold, max_links_per_site)
+    with mp.get_context("spawn").Pool(processes=worker_processes) as pool:
+        for scraped in pool.imap_unordered(worker, batches):
+            for (site_name, _, _), outcome in scraped:
+                if isinstance(outcome, str):
+                    st.warning(f"⚠️ Error scraping {site_name}: {outcome}")
+                    continue
+                for brand, keyword, unique_links in outcome:
+                    emit(brand, keyword, site_name, unique_links)
+            
+            completed += len(scraped)
+            progress_bar.progress(completed / len(pages))
+            status_text.text(f"🔍 Fetched {completed}/{len(pages)} search pages...")
+
+# Collects every link's attributes in one WebDriver call instead of one call per attribute
+LINK_DUMP_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(a =>
+    [a.href, a.innerText || '', a.title || '', a.getAttribute('alt') || '']);
+"""
+
+# Extract link candidates from the page loaded in the driver
+def find_links(driver, config):
+    rows = driver.execute_script(LINK_DUMP_SCRIPT, config['product_selector'])
+    
+    for href, link_text, title_attr, alt_attr in rows:
+        yield href, link_text.strip(), title_attr, alt_attr
+
+# Resources Chrome never downloads while scraping
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.css", "*.mp4",
+    "*analytics*", "*doubleclick*",
+]
+
+# Start one Chrome instance - MODIFIED FOR CLOUD DEPLOYMENT
+def make_driver():
     # Setup Chrome for Streamlit Community Cloud
     options = Options()
     options.add_argument("--headless")
@@ -207,93 +282,264 @@ def run_scraper(df_input, progress_bar, status_text):
     options.add_argument("--window-size=1920x1080")
     options.add_argument("--disable-features=VizDisplayCompositor")
     
+    # Skip images and notifications; product links are all we read
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    
+    # Use Service with no specific path; it will find the driver automatically in the cloud environment
+    service = Service()
+    driver = webdriver.Chrome(service=service, options=options)
+    atexit.register(driver.quit)
+    
+    # Block heavy static assets and trackers at the network layer
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+# One Chrome instance per site, reused across scraping runs
+@st.cache_resource(show_spinner=False)
+def get_driver_pool():
+    return {}
+
+# Held for a whole Selenium run: sessions share the pooled drivers, so only one run may use them at a time
+@st.cache_resource(show_spinner=False)
+def get_driver_pool_lock():
+    return threading.Lock()
+
+# Errors meaning a pooled driver's browser or chromedriver is gone (expired session, crash, OOM kill)
+DEAD_DRIVER_ERRORS = (WebDriverException, ConnectionError, Urllib3HTTPError)
+
+# Return the pooled drivers for these sites, replacing only those whose browser session has died
+def get_live_drivers(site_names):
+    pool = get_driver_pool()
+    for site_name in site_names:
+        driver = pool.get(site_name)
+        if driver is not None:
+            try:
+                driver.get("about:blank")
+                continue
+            except DEAD_DRIVER_ERRORS:
+                atexit.unregister(driver.quit)
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+        pool[site_name] = make_driver()
+    return {site_name: pool[site_name] for site_name in site_names}
+
+# After scrolling, a page whose link count holds for this many polls is treated as not lazy-loading
+SCROLL_POLL_SECONDS = 0.25
+SCROLL_SETTLE_POLLS = 4
+
+# Load one search page and collect its link candidates
+def scrape_one_site(driver, search_url, config):
+    driver.get(search_url)
+    
+    # Continue as soon as any product link is in the DOM; page_delay is only the upper bound
     try:
-        # Use Service with no specific path; it will find the driver automatically in the cloud environment
-        service = Service()
-        driver = webdriver.Chrome(service=service, options=options)
-    except Exception as e:
-        st.error(f"❌ ChromeDriver Error: Could not start Chrome. Error: {str(e)}")
-        return None
+        WebDriverWait(driver, page_delay).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, config['product_selector']))
+        )
+    except TimeoutException:
+        pass
+    
+    # Scroll to trigger lazy-loaded listings unless the page already has enough links
+    loaded = len(driver.find_elements(By.CSS_SELECTOR, config['product_selector']))
+    if loaded < max_links_per_site:
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        polls = 0
+        
+        # Done once more links appear, or once a fully loaded page has stayed unchanged for a while
+        def more_links_or_settled(d):
+            nonlocal polls
+            polls += 1
+            if len(d.find_elements(By.CSS_SELECTOR, config['product_selector'])) > loaded:
+                return True
+            return polls > SCROLL_SETTLE_POLLS and d.execute_script("return document.readyState") == "complete"
+        
+        try:
+            WebDriverWait(driver, scroll_delay, poll_frequency=SCROLL_POLL_SECONDS).until(more_links_or_settled)
+        except TimeoutException:
+            pass
+    
+    return list(find_links(driver, config))
+
+# Worker thread: load every search page for one site on that site's driver until cancelled
+def scrape_site_pages(driver, site_pages, config, results_queue, cancel):
+    for page in site_pages:
+        if cancel.is_set():
+            return
+        try:
+            results_queue.put((page, scrape_one_site(driver, page[2], config)))
+        except Exception as e:
+            results_queue.put((page, e))
+
+# Selenium fallback for JS-heavy pages
+def scrape_with_selenium(pages, sites, on_page, progress_bar, status_text):
+    pages_by_site = defaultdict(list)
+    for page in pages:
+        pages_by_site[page[0]].append(page)
+    
+    # Wait in short steps so a Stop or rerun can still interrupt this session while another one scrapes
+    pool_lock = get_driver_pool_lock()
+    while not pool_lock.acquire(timeout=1):
+        status_text.text("⏳ Waiting for another session to finish using the browsers...")
     
     try:
-        total_operations = len(df_input) * len([col for col in df_input.columns if 'Keyword' in col]) * len(sites)
-        current_operation = 0
+        try:
+            drivers = get_live_drivers(pages_by_site)
+        except Exception as e:
+            st.error(f"❌ ChromeDriver Error: Could not start Chrome. Error: {str(e)}")
+            return
         
-        for _, row in df_input.iterrows():
-            brand = row['Brand']
-            keywords = [str(row[col]) for col in row.index if 'Keyword' in col and pd.notna(row[col])]
+        # Workers only touch their own driver; Streamlit calls stay on this thread
+        results_queue = queue.Queue()
+        cancel = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(pages_by_site))
+        try:
+            for site_name, site_pages in pages_by_site.items():
+                executor.submit(scrape_site_pages, drivers[site_name], site_pages, sites[site_name], results_queue, cancel)
             
-            for keyword in keywords:
-                search_term = f"{brand} {keyword}"
+            for current_operation in range(1, len(pages) + 1):
+                page, outcome = results_queue.get()
+                site_name, search_term, _ = page
+                progress_bar.progress(current_operation / len(pages))
+                status_text.text(f"🔍 Searched {site_name} for '{search_term}'...")
                 
-                for site_name, config in sites.items():
-                    current_operation += 1
-                    progress = current_operation / total_operations
-                    progress_bar.progress(progress)
-                    status_text.text(f"🔍 Searching {site_name} for '{search_term}'...")
-                    
-                    unique_links = set()
-                    page = 1
-                    
-                    if config['url_encoding'] == '-':
-                        formatted_term = search_term.replace(' ', '-').lower()
-                    else:
-                        formatted_term = search_term.replace(' ', config['url_encoding'])
-                    
-                    search_url = config['url_template'].format(search_term=formatted_term, page=page)
-                    
-                    try:
-                        driver.get(search_url)
-                        time.sleep(page_delay)
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(scroll_delay)
-                        
-                        links = driver.find_elements(By.CSS_SELECTOR, config['product_selector'])
-                        
-                        if not links and config['additional_selectors']:
-                            for selector in config['additional_selectors']:
-                                links.extend(driver.find_elements(By.CSS_SELECTOR, selector))
-                        
-                        for link in links:
-                            href = link.get_attribute("href")
-                            if href and config['domain_check'] in href:
-                                should_add = False
-                                
-                                if config['brand_in_url']:
-                                    should_add = fuzzy_match_brand(href, brand, fuzzy_threshold)
-                                else:
-                                    link_text = link.text.strip()
-                                    title_attr = link.get_attribute("title") or ""
-                                    alt_attr = link.get_attribute("alt") or ""
-                                    combined_text = f"{link_text} {title_attr} {alt_attr}"
-                                    
-                                    should_add = fuzzy_match_brand(combined_text, brand, fuzzy_threshold)
-                                    if not fuzzy_enabled: # If fuzzy is off, add any valid link
-                                        should_add = True
-                                
-                                if should_add:
-                                    unique_links.add(href)
-                                
-                                if len(unique_links) >= max_links_per_site:
-                                    break
-                                    
-                    except Exception as e:
-                        st.warning(f"⚠️ Error scraping {site_name}: {str(e)}")
-                        continue
-                    
-                    for link in unique_links:
-                        results.append({
-                            "Brand": brand,
-                            "Keyword": keyword,
-                            "Site": site_name,
-                            "Product URL": link,
-                            "Scraped At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        })
-                        
+                if isinstance(outcome, Exception):
+                    st.warning(f"⚠️ Error scraping {site_name}: {str(outcome)}")
+                    continue
+                
+                on_page(page, outcome)
+            
+        finally:
+            # On Stop, rerun or error, workers quit after their current page instead of working through the rest
+            cancel.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            
+            # Leave the shared browsers clean for the next run
+            for driver in drivers.values():
+                try:
+                    driver.delete_all_cookies()
+                    driver.get("about:blank")
+                except Exception:
+                    pass
     finally:
-        driver.quit()
+        pool_lock.release()
+
+# Columns of the results file
+RESULT_FIELDS = ["Brand", "Keyword", "Site", "Product URL", "Scraped At"]
+
+# Main scraping function - streams rows to a temporary CSV and returns its path
+def run_scraper(df_input, keyword_cols, progress_bar, status_text):
+    sites = get_site_configs(tuple(selected_sites))
+    
+    # Pre-compute every search up front; identical search URLs are fetched only once
+    # Lowercase value_name so it can never collide with a 'Keyword...' column
+    tasks = df_input[['Brand', *keyword_cols]].melt(id_vars='Brand', value_name='keyword').dropna(subset=['Brand', 'keyword'])
+    
+    pages = {}
+    searches_by_url = defaultdict(dict)
+    for brand, keyword in zip(tasks['Brand'].to_numpy(), tasks['keyword'].to_numpy()):
+        brand, keyword = str(brand), str(keyword)
+        search_term = f"{brand} {keyword}"
+        
+        for site_name, config in sites.items():
+            search_url = build_search_url(config, search_term)
+            pages.setdefault(search_url, (site_name, search_term, search_url))
+            searches_by_url[search_url][(brand, keyword)] = None
+    
+    if not pages:
+        return None
+    
+    # Run-wide record of emitted (brand, URL) pairs so a product found under several keywords is written once
+    seen = ScalableBloomFilter(initial_capacity=10_000, error_rate=1e-4)
+    row_count = 0
+    results_file = tempfile.NamedTemporaryFile("w", newline="", suffix=".csv", encoding="utf-8", delete=False)
+    try:
+        with results_file:
+            writer = csv.DictWriter(results_file, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            
+            def emit(brand, keyword, site_name, unique_links):
+                nonlocal row_count
+                for link in unique_links:
+                    seen_key = f"{brand}\n{link}"
+                    if seen_key in seen:
+                        continue
+                    seen.add(seen_key)
+                    writer.writerow({
+                        "Brand": brand,
+                        "Keyword": keyword,
+                        "Site": site_name,
+                        "Product URL": link,
+                        "Scraped At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    })
+                    row_count += 1
+            
+            if use_selenium or worker_processes == 1:
+                # Brand invariants are computed once per brand, not once per link
+                matchers = {brand: make_matcher(brand, fuzzy_threshold, fuzzy_enabled) for brand in {brand for searches in searches_by_url.values() for brand, _ in searches}}
+                
+                def on_page(page, candidates):
+                    site_name, _, search_url = page
+                    searches = searches_by_url[search_url]
+                    for brand, keyword, unique_links in match_page(candidates, searches, matchers, sites[site_name],
+                                                                   max_links_per_site, fuzzy_enabled):
+                        emit(brand, keyword, site_name, unique_links)
+                
+                if use_selenium:
+                    scrape_with_selenium(list(pages.values()), sites, on_page, progress_bar, status_text)
+                else:
+                    scrape_with_httpx(list(pages.values()), sites, on_page, progress_bar, status_text)
+            else:
+                scrape_in_processes(list(pages.values()), searches_by_url, sites, emit, progress_bar, status_text)
+    except BaseException:
+        # A Stop, rerun or scraping error must not leave the partial results file behind
+        os.unlink(results_file.name)
+        raise
+    
+    if not row_count:
+        os.unlink(results_file.name)
+        return None
     
-    return pd.DataFrame(results) if results else None
+    return results_file.name
+
+# Rows of the results file read at a time
+RESULTS_CHUNK_SIZE = 10_000
+
+# Summarize the results file chunk by chunk instead of loading it whole
+def summarize_results(results_path):
+    total_urls = 0
+    brands, keywords = set(), set()
+    site_counts = Counter()
+    for chunk in pd.read_csv(results_path, dtype=str, chunksize=RESULTS_CHUNK_SIZE):
+        total_urls += len(chunk)
+        brands.update(chunk['Brand'].dropna())
+        keywords.update(chunk['Keyword'].dropna())
+        site_counts.update(chunk['Site'].dropna())
+    return {
+        "total_urls": total_urls,
+        "brands": len(brands),
+        "sites": len(site_counts),
+        "keywords": len(keywords),
+        "site_counts": pd.Series(dict(site_counts.most_common()), name="count")
+    }
+
+# Convert the results CSV to .xlsx bytes one row at a time.
+# pandas writes cells column by column, which xlsxwriter's constant_memory mode cannot handle.
+def results_to_excel(results_path):
+    excel_buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(excel_buffer, {'constant_memory': True, 'strings_to_urls': False})
+    worksheet = workbook.add_worksheet()
+    with open(results_path, newline="", encoding="utf-8") as f:
+        for row_idx, row in enumerate(csv.reader(f)):
+            worksheet.write_row(row_idx, 0, row)
+    workbook.close()
+    return excel_buffer.getvalue()
 
 # --- Execute Scraping ---
 st.markdown('<div class="section-header">🚀 Execute Scraping</div>', unsafe_allow_html=True)
@@ -308,60 +554,60 @@ if uploaded_csv is not None and selected_sites:
             status_text = st.empty()
             
             with st.spinner("Initializing scraper... This may take a moment."):
-                results_df = run_scraper(df_input, progress_bar, status_text)
+                results_path = run_scraper(df_input, keyword_cols, progress_bar, status_text)
             
-            if results_df is not None and len(results_df) > 0:
-                status_text.text("✅ Scraping completed!")
-                
-                # --- Results Section ---
-                st.markdown('<div class="section-header">📊 Results Summary</div>', unsafe_allow_html=True)
-                
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total URLs", len(results_df))
-                with col2:
-                    st.metric("Brands Processed", results_df['Brand'].nunique())
-                with col3:
-                    st.metric("Sites Used", results_df['Site'].nunique())
-                with col4:
-                    st.metric("Keywords Used", results_df['Keyword'].nunique())
-                
-                site_counts = results_df['Site'].value_counts()
-                st.bar_chart(site_counts)
-                
-                st.markdown('<div class="section-header">📋 Results Preview</div>', unsafe_allow_html=True)
-                st.dataframe(results_df.head(20), use_container_width=True)
-                
-                # --- Download Section ---
-                st.markdown('<div class="section-header">💾 Download Results</div>', unsafe_allow_html=True)
-                
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                
-                # Excel download
-                output_buffer = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-                results_df.to_excel(output_buffer.name, index=False)
-                with open(output_buffer.name, 'rb') as f:
-                    excel_data = f.read()
-                
-                st.download_button(
-                    label="📊 Download Excel File",
-                    data=excel_data,
-                    file_name=f"b2b_scraper_results_{timestamp}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
-                
-                # CSV download
-                csv_data = results_df.to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="📄 Download CSV File",
-                    data=csv_data,
-                    file_name=f"b2b_scraper_results_{timestamp}.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
-                
-                os.unlink(output_buffer.name)
+            if results_path is not None:
+                try:
+                    status_text.text("✅ Scraping completed!")
+                    summary = summarize_results(results_path)
+                    
+                    # --- Results Section ---
+                    st.markdown('<div class="section-header">📊 Results Summary</div>', unsafe_allow_html=True)
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("Total URLs", summary["total_urls"])
+                    with col2:
+                        st.metric("Brands Processed", summary["brands"])
+                    with col3:
+                        st.metric("Sites Used", summary["sites"])
+                    with col4:
+                        st.metric("Keywords Used", summary["keywords"])
+                    
+                    st.bar_chart(summary["site_counts"])
+                    
+                    st.markdown('<div class="section-header">📋 Results Preview</div>', unsafe_allow_html=True)
+                    st.dataframe(pd.read_csv(results_path, dtype=str, nrows=20), use_container_width=True)
+                    
+                    # --- Download Section ---
+                    st.markdown('<div class="section-header">💾 Download Results</div>', unsafe_allow_html=True)
+                    
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    
+                    # Excel download
+                    excel_data = results_to_excel(results_path)
+                    
+                    st.download_button(
+                        label="📊 Download Excel File",
+                        data=excel_data,
+                        file_name=f"b2b_scraper_results_{timestamp}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True
+                    )
+                    
+                    # CSV download
+                    with open(results_path, 'rb') as f:
+                        csv_data = f.read()
+                    st.download_button(
+                        label="📄 Download CSV File",
+                        data=csv_data,
+                        file_name=f"b2b_scraper_results_{timestamp}.csv",
+                        mime="text/csv",
+                        use_container_width=True
+                    )
+                finally:
+                    # Remove the results file even if building the summary or downloads fails
+                    os.unlink(results_path)
                 
             else:
                 st.error("❌ No results found. Please check your configuration and try again.")
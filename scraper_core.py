@@ -0,0 +1,160 @@
+# Scraping core shared by the Streamlit app and its worker processes.
+# Kept free of Streamlit so spawned workers can import it; all settings arrive as arguments.
+import asyncio
+import itertools
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urljoin
+from rapidfuzz import fuzz, process
+
+# Fuzzy matching function - builds one batch matcher per brand
+def make_matcher(brand_name, threshold=80, fuzzy_enabled=True):
+    brand_lower = brand_name.lower()
+    brand_chars = frozenset(brand_lower)
+    cache = {}
+    
+    def score_texts(texts, match_url):
+        if not fuzzy_enabled:
+            return [brand_lower in text for text in texts]
+        
+        # URLs have no word boundaries, so match the brand anywhere in the href
+        if match_url:
+            scores = process.cdist([brand_lower], texts, scorer=fuzz.partial_ratio, score_cutoff=threshold)[0]
+            return [score >= threshold for score in scores]
+        
+        matched = [brand_lower in text for text in texts]
+        word_lists = [
+            [] if is_match else [word for word in text.split() if len(word) >= 3]
+            for text, is_match in zip(texts, matched)
+        ]
+        words = list(dict.fromkeys(word for word_list in word_lists for word in word_list))
+        if words:
+            scores = process.cdist([brand_lower], words, scorer=fuzz.ratio, score_cutoff=threshold)[0]
+            close_words = {word for word, score in zip(words, scores) if score >= threshold}
+            matched = [is_match or any(word in close_words for word in word_list)
+                       for is_match, word_list in zip(matched, word_lists)]
+        return matched
+    
+    # Score a whole page of texts at once; repeated texts are answered from the cache
+    def matcher(texts, match_url=False):
+        lowered = [text.lower() for text in texts]
+        pending = []
+        for text in dict.fromkeys(lowered):
+            if (match_url, text) in cache:
+                continue
+            # A text sharing no characters with the brand can never match, so skip scoring it
+            if brand_chars.isdisjoint(text):
+                cache[(match_url, text)] = False
+            else:
+                pending.append(text)
+        if pending:
+            for text, is_match in zip(pending, score_texts(pending, match_url)):
+                cache[(match_url, text)] = is_match
+        return [cache[(match_url, text)] for text in lowered]
+    
+    return matcher
+
+# HTTP fetching settings
+MAX_CONCURRENT_REQUESTS = 10
+REQUEST_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+CONNECTION_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Filter (href, text, title, alt) candidates down to matching product links
+def filter_links(candidates, matcher, config, max_links, fuzzy_enabled):
+    valid = (c for c in candidates if c[0] and config['domain_check'] in c[0])
+    
+    # Score only as many links as are still needed, so nothing past the last needed link gets matched
+    unique_links = set()
+    while len(unique_links) < max_links:
+        batch = list(itertools.islice(valid, max_links - len(unique_links)))
+        if not batch:
+            break
+        
+        if config['brand_in_url']:
+            matches = matcher([href for href, _, _, _ in batch], match_url=True)
+        elif not fuzzy_enabled: # If fuzzy is off, add any valid link
+            matches = [True] * len(batch)
+        else:
+            combined_texts = [f"{link_text} {title_attr} {alt_attr}" for _, link_text, title_attr, alt_attr in batch]
+            matches = matcher(combined_texts)
+        
+        for (href, _, _, _), should_add in zip(batch, matches):
+            if len(unique_links) >= max_links:
+                break
+            if should_add:
+                unique_links.add(href)
+    return unique_links
+
+# Extract link candidates from raw HTML
+def parse_links(html, base_url, config):
+    for node in LexborHTMLParser(html).css(config['product_selector']):
+        href = node.attributes.get('href')
+        yield (
+            urljoin(base_url, href) if href else None,
+            node.text(separator=' ', strip=True),
+            node.attributes.get('title') or "",
+            node.attributes.get('alt') or ""
+        )
+
+async def fetch(client, url):
+    response = await client.get(url)
+    response.raise_for_status()
+    return response.text
+
+async def fetch_with_semaphore(semaphore, client, url):
+    async with semaphore:
+        return await fetch(client, url)
+
+# Fetch search pages concurrently over plain HTTP, handing each page's links (or error) to on_result
+async def fetch_pages(pages, sites, on_result):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
+    async def fetch_page(client, page):
+        site_name, _, search_url = page
+        try:
+            html = await fetch_with_semaphore(semaphore, client, search_url)
+        except Exception as e:
+            on_result(page, e)
+        else:
+            on_result(page, list(parse_links(html, search_url, sites[site_name])))
+    
+    # One long-lived client per run: keep-alive and HTTP/2 share each host's TLS connection across searches
+    async with httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+        timeout=REQUEST_TIMEOUT,
+        limits=CONNECTION_LIMITS
+    ) as client:
+        await asyncio.gather(*[fetch_page(client, page) for page in pages])
+
+# Match one fetched page against every (brand, keyword) that searched for it
+def match_page(candidates, searches, matchers, config, max_links, fuzzy_enabled):
+    return [
+        (brand, keyword, filter_links(candidates, matchers[brand], config, max_links, fuzzy_enabled))
+        for brand, keyword in searches
+    ]
+
+# Worker process: fetch and match one batch of (page, searches) with its own client and matchers.
+# Errors come back as strings since not every httpx exception can be pickled.
+def scrape_batch(sites, fuzzy_enabled, fuzzy_threshold, max_links, batch):
+    searches_by_url = {page[2]: searches for page, searches in batch}
+    matchers = {}
+    scraped = []
+    
+    def on_result(page, outcome):
+        if isinstance(outcome, Exception):
+            scraped.append((page, str(outcome)))
+            return
+        searches = searches_by_url[page[2]]
+        for brand, _ in searches:
+            if brand not in matchers:
+                matchers[brand] = make_matcher(brand, fuzzy_threshold, fuzzy_enabled)
+        scraped.append((page, match_page(outcome, searches, matchers, sites[page[0]], max_links, fuzzy_enabled)))
+    
+    asyncio.run(fetch_pages([page for page, _ in batch], sites, on_result))
+    return scraped
\ No newline at end of file